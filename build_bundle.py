@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Build the binary solver bundle (wordle_bundle.bin) from the text lists.
+
+The bundle holds the encoded word array, the answer prior, the feedback rows of the
+openers, the opening-reply table and checksums of the files it was built from.
+getEngine() loads it with zero-copy views and falls back to the text lists whenever
+one of those files has changed, so rerun this after editing them.
+
+Usage:
+    python build_bundle.py            # rebuild
+    python build_bundle.py --check    # compare cold-load times of the bundle and the text lists
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np # type: ignore
+
+from bundle import fileChecksum, loadBundle, writeBundle
+from feedback import encodeWords
+from solver import BUNDLE_FILE, BUNDLE_SOURCES, OPENING_TABLE_FILE, loadBundledEngine, loadTextEngine
+
+def openingTableArrays(engine, top: int) -> dict:
+    """
+    This function packs the engine's opening-reply table into flat arrays.
+    """
+    openers = sorted(engine.openingTable)
+    replies = [(o, code, reply) for o, opener in enumerate(openers) for code, reply in sorted(engine.openingTable[opener].items())]
+    ranking = np.full((len(replies), top), -1, dtype=np.int32)
+    scores = np.zeros((len(replies), top, 3))
+    isCandidate = np.zeros((len(replies), top), dtype=np.uint8)
+    for i, (_, _, reply) in enumerate(replies):
+        for j, (word, score, entropy, expected, candidate) in enumerate(reply['ranking'][:top]):
+            ranking[i, j] = engine.index[word]
+            scores[i, j] = (score, entropy, expected)
+            isCandidate[i, j] = candidate
+    return {
+        'openers': encodeWords(openers),
+        'opener_patterns': np.stack([engine.patternRow(opener) for opener in openers]) if openers else np.zeros((0, len(engine.words)), dtype=np.uint8),
+        'reply_opener': np.array([o for o, _, _ in replies], dtype=np.uint16),
+        'reply_code': np.array([code for _, code, _ in replies], dtype=np.uint16),
+        'reply_next': np.array([engine.index[reply['next']] for _, _, reply in replies], dtype=np.int32),
+        'reply_candidates': np.array([reply['candidates'] for _, _, reply in replies], dtype=np.int32),
+        'reply_ranking': ranking,
+        'reply_scores': scores,
+        'reply_is_candidate': isCandidate,
+    }
+
+def buildBundle(filename: str = BUNDLE_FILE):
+    """
+    This function regenerates the bundle from the text lists and the JSON opening table.
+    """
+    engine = loadTextEngine()
+    arrays = {'words': engine.codes, 'prior': engine.prior}
+    metadata = {
+        'dictionary': engine.checksum,
+        'sources': {os.path.basename(path): fileChecksum(path) if os.path.exists(path) else None for path in BUNDLE_SOURCES},
+    }
+    if engine.openingTable:
+        top = max(len(reply['ranking']) for replies in engine.openingTable.values() for reply in replies.values())
+        arrays.update(openingTableArrays(engine, top))
+        metadata['opening'] = {
+            'dictionary': engine.checksum,
+            'prior': engine.priorChecksum,
+            'strategy': engine.strategy,
+            'endgame_threshold': engine.endgameThreshold,
+            'endgame_node_budget': engine.endgameNodeBudget,
+        }
+    else:
+        print(f"No usable opening table in {OPENING_TABLE_FILE}; bundling the word lists only")
+    writeBundle(filename, arrays, metadata)
+    print(f"Saved {len(engine.words)} words and {len(engine.openingTable)} openers to {filename} ({os.path.getsize(filename) / 1024:.0f} KiB)")
+
+def checkBundle(filename: str = BUNDLE_FILE, repeats: int = 5):
+    """
+    This function reports how long it takes to load all solver data from the bundle
+    and from the text lists, and checks that both give the same engine.
+    """
+    def best(load):
+        times = []
+        for _ in range(repeats):
+            starttime = time.perf_counter()
+            engine = load()
+            times.append(time.perf_counter() - starttime)
+        return engine, min(times) * 1000
+
+    fromText, textMs = best(loadTextEngine)
+    fromBundle, bundleMs = best(lambda: loadBundledEngine(filename))
+    if fromBundle is None:
+        print(f"{filename} is missing or stale; run python build_bundle.py")
+        return False
+    same = (fromBundle.words == fromText.words and np.array_equal(fromBundle.prior, fromText.prior)
+            and fromBundle.openingTable == fromText.openingTable)
+    _, mapMs = best(lambda: loadBundle(filename))
+    print(f"Text lists: {textMs:.1f} ms, bundle: {bundleMs:.1f} ms (mapping and checksum: {mapMs:.2f} ms)")
+    print("Bundle matches the text lists" if same else "Bundle does NOT match the text lists")
+    return same
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the binary solver data bundle from the text lists.")
+    parser.add_argument("-o", "--output", default=BUNDLE_FILE)
+    parser.add_argument("--check", action="store_true", help="time loading the existing bundle instead of rebuilding")
+    args = parser.parse_args(argv)
+    if args.check:
+        checkBundle(args.output)
+    else:
+        buildBundle(args.output)
+
+if __name__ == "__main__":
+    main()
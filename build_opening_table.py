@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Build the opening-reply table (opening_replies.json).
+
+For every opener and each feedback it can produce, stores the second guess the engine
+would play and its top-ranked alternatives, so turn two becomes a dictionary lookup.
+The table records the dictionary and answer-prior checksums, strategy and endgame
+settings it was built with; the engine ignores it if any of those differ.
+
+Usage:
+    python build_opening_table.py                      # openers from best_starting_words.txt
+    python build_opening_table.py --openers arise slate --top 10
+"""
+
+import argparse
+import json
+import os
+import time
+
+from feedback import ALL_GREEN
+from solver import DATA_DIR, OPENING_TABLE_FILE, getEngine
+
+STARTING_WORDS_FILE = os.path.join(DATA_DIR, "best_starting_words.txt")
+
+def buildOpeningReplies(engine, opener: str, top: int = 5) -> dict:
+    """
+    This function computes the reply to every feedback code of `opener`.
+    """
+    row = engine.patternRow(opener)
+    replies = {}
+    for code in sorted(set(row.tolist())):
+        if code == ALL_GREEN:
+            continue  # solved on the first guess
+        candidates = {engine.words[i] for i in (row == code).nonzero()[0]}
+        nextGuess, ranking = engine.suggest(candidates, top)
+        replies[str(int(code))] = {
+            'next': nextGuess,
+            'candidates': len(candidates),
+            'ranking': [
+                [item['word'], item['score'], item['entropy'], item['expected_remaining'], item['is_candidate']]
+                for item in ranking
+            ],
+        }
+    return replies
+
+def loadOpeners(filename: str = STARTING_WORDS_FILE) -> list[str]:
+    """
+    This function loads the supported openers, without duplicates.
+    """
+    with open(filename, "r") as f:
+        words = [line.strip().lower() for line in f if line.strip()]
+    return list(dict.fromkeys(words))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the best second guess for each opener and feedback.")
+    parser.add_argument("--openers", nargs="+", default=None, help="openers to include (default: best_starting_words.txt)")
+    parser.add_argument("--top", type=int, default=5, help="ranked alternatives stored per feedback")
+    parser.add_argument("-o", "--output", default=OPENING_TABLE_FILE)
+    args = parser.parse_args(argv)
+
+    engine = getEngine()
+    openers = [word.lower() for word in args.openers] if args.openers else loadOpeners()
+    table = {
+        'dictionary': engine.checksum,
+        'prior': engine.priorChecksum,
+        'strategy': engine.strategy,
+        'endgame_threshold': engine.endgameThreshold,
+        'endgame_node_budget': engine.endgameNodeBudget,
+        'top': args.top,
+        'openers': {},
+    }
+    for opener in openers:
+        starttime = time.time()
+        table['openers'][opener] = buildOpeningReplies(engine, opener, args.top)
+        print(f"{opener.upper()}: {len(table['openers'][opener])} feedback codes in {time.time() - starttime:.1f} seconds")
+
+    with open(args.output, "w") as f:
+        json.dump(table, f, separators=(",", ":"))
+    print(f"Saved opening table for {len(openers)} openers to {args.output} ({os.path.getsize(args.output) / 1024:.0f} KiB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Headless bulk solver that streams one JSON line per game.
+
+Each input line is an answer, optionally followed by guesses that were already
+played (e.g. "crown arise mount"). The solver replays those guesses, finishes the
+game with the shared solver engine and writes the full guess sequence with timings.
+
+Usage:
+    python bulk_solve.py all_historical_wordles.txt -o results.jsonl
+    cat answers.txt | python bulk_solve.py - --resume -o results.jsonl
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+from feedback import getFeedback
+from solver import SCORING_STRATEGIES, getEngine
+
+WORD_PATTERN = re.compile(r"[a-z]{5}")
+
+def parseGameLine(line: str):
+    """
+    This function splits an input line into the answer and the guesses already played.
+    Returns (None, []) for a line with no words (e.g. only separators).
+    """
+    words = line.replace(",", " ").lower().split()
+    if not words:
+        return None, []
+    return words[0], words[1:]
+
+def isWord(word: str) -> bool:
+    """
+    This function checks that a word is five ASCII letters.
+    """
+    return word is not None and WORD_PATTERN.fullmatch(word) is not None
+
+def solveGame(engine, answer: str, history: list[str], maxGuesses: int = 6, firstGuess: str = "arise", strategy: str = None, workers: int = None):
+    """
+    Solve a single game without printing, replaying any guesses in `history` first.
+    Returns a result dict with the guess sequence and the time spent choosing each guess.
+    """
+    candidates = engine.wordSet
+    guesses = []
+    timings = []
+    solved = False
+    for round_num in range(1, maxGuesses + 1):
+        starttime = time.perf_counter()
+        if round_num <= len(history):
+            nextGuess = history[round_num - 1]
+        elif round_num == 1:
+            nextGuess = firstGuess
+        elif len(candidates) == 0:
+            break
+        else:
+            opening = (guesses[0], getFeedback(guesses[0], answer)) if round_num == 2 else None
+            nextGuess = engine.nextGuess(candidates, strategy=strategy, workers=workers, opening=opening)
+        timings.append(round(time.perf_counter() - starttime, 6))
+        guesses.append(nextGuess)
+        feedback = getFeedback(nextGuess, answer)
+        if feedback == 242:  # All green
+            solved = True
+            break
+        candidates = engine.filterCandidates(candidates, nextGuess, feedback)
+    return {
+        'answer': answer,
+        'solved': solved,
+        'guesses': len(guesses),
+        'guess_sequence': guesses,
+        'replayed': min(len(history), len(guesses)),
+        'timings': timings,
+        'total_time': round(sum(timings), 6),
+    }
+
+def countCompletedLines(filename: str) -> int:
+    """
+    This function counts the complete lines of a previous output file and
+    truncates a trailing partial line left behind by an interrupted run.
+    """
+    if not os.path.exists(filename):
+        return 0
+    completed = 0
+    goodBytes = 0
+    with open(filename, 'rb') as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            completed += 1
+            goodBytes += len(line)
+    with open(filename, 'r+b') as f:
+        f.truncate(goodBytes)
+    return completed
+
+def bulkSolve(engine, inputFile, outputFile, skip: int = 0, maxGuesses: int = 6, firstGuess: str = "arise", strategy: str = None, workers: int = None):
+    """
+    Stream games from `inputFile` to `outputFile` as JSON lines, flushing after each game.
+    Lines without words are ignored and invalid lines become error records; the first
+    `skip` games are passed over without solving.
+    """
+    index = 0
+    for line in inputFile:
+        answer, history = parseGameLine(line)
+        if answer is None:
+            continue
+        index += 1
+        if index <= skip:
+            continue
+        if not isWord(answer) or not all(isWord(guess) for guess in history):
+            result = {'answer': answer, 'error': f"invalid game line: {line.strip()!r}"}
+        else:
+            result = solveGame(engine, answer, history, maxGuesses, firstGuess, strategy, workers)
+        result['index'] = index
+        outputFile.write(json.dumps(result) + "\n")
+        outputFile.flush()
+    return index
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve many Wordle games and stream JSONL results.")
+    parser.add_argument("input", help="file with one answer (plus optional played guesses) per line, or '-' for stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file, or '-' for stdout (default)")
+    parser.add_argument("--resume", action="store_true", help="skip games already written to the output file")
+    parser.add_argument("--max-guesses", type=int, default=6)
+    parser.add_argument("--first-guess", default="arise")
+    parser.add_argument("--strategy", default=None, choices=sorted(SCORING_STRATEGIES), help="scoring strategy (default: entropy)")
+    parser.add_argument("--workers", type=int, default=None, help="threads used to score guesses")
+    args = parser.parse_args(argv)
+
+    if args.resume and args.output == "-":
+        parser.error("--resume needs an output file")
+    skip = countCompletedLines(args.output) if args.resume else 0
+
+    inputFile = sys.stdin if args.input == "-" else open(args.input, 'r')
+    outputFile = sys.stdout if args.output == "-" else open(args.output, 'a' if args.resume else 'w')
+    try:
+        total = bulkSolve(getEngine(), inputFile, outputFile, skip, args.max_guesses, args.first_guess.lower(), args.strategy, args.workers)
+    finally:
+        if inputFile is not sys.stdin:
+            inputFile.close()
+        if outputFile is not sys.stdout:
+            outputFile.close()
+    print(f"Processed {total} games ({skip} resumed from {args.output})", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
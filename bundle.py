@@ -0,0 +1,108 @@
+"""
+Compact binary bundle holding all solver data in one versioned file.
+
+Layout:
+    magic (8 bytes) | version (uint32) | header length (uint32) | header JSON | padding | payload
+
+The header JSON lists each section's dtype, shape and offset into the payload, plus a
+SHA-256 checksum of the payload and free-form metadata. Sections are 64-byte aligned,
+so loading maps the file once and returns zero-copy read-only np.frombuffer views.
+"""
+
+import hashlib
+import json
+import mmap
+import struct
+
+import numpy as np # type: ignore
+
+BUNDLE_MAGIC = b"WRDLBNDL"
+BUNDLE_VERSION = 1
+ALIGNMENT = 64
+_PREFIX = struct.Struct("<8sII")
+
+class BundleError(ValueError):
+    """
+    Raised when a bundle file is malformed, has the wrong version or fails its checksum.
+    """
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+def fileChecksum(filename: str) -> str:
+    """
+    This function returns the SHA-256 of a file's raw bytes.
+    """
+    with open(filename, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def writeBundle(filename: str, arrays: dict, metadata: dict = None):
+    """
+    This function writes named arrays and metadata to a bundle file.
+    """
+    sections = {}
+    chunks = []
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        data = array.tobytes()
+        padding = _aligned(offset) - offset
+        chunks.append(b"\0" * padding)
+        offset += padding
+        sections[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset, 'nbytes': len(data)}
+        chunks.append(data)
+        offset += len(data)
+    payload = b"".join(chunks)
+    header = json.dumps({
+        'sections': sections,
+        'payload_sha256': hashlib.sha256(payload).hexdigest(),
+        'metadata': metadata or {},
+    }, sort_keys=True).encode("utf-8")
+    start = _aligned(_PREFIX.size + len(header))
+    with open(filename, "wb") as f:
+        f.write(_PREFIX.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(header)))
+        f.write(header)
+        f.write(b"\0" * (start - _PREFIX.size - len(header)))
+        f.write(payload)
+
+def loadBundle(filename: str, verify: bool = True):
+    """
+    This function maps a bundle file and returns (arrays, metadata). The arrays are
+    read-only views into the mapped file; pass verify=False to skip the checksum.
+    Any damage to the file (truncation, a corrupt header or out-of-range sections)
+    raises BundleError.
+    """
+    with open(filename, "rb") as f:
+        size = f.seek(0, 2)
+        if size < _PREFIX.size:
+            raise BundleError(f"{filename} is too short to be a bundle")
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, headerLength = _PREFIX.unpack_from(buffer)
+    if magic != BUNDLE_MAGIC:
+        raise BundleError(f"{filename} is not a solver bundle")
+    if version != BUNDLE_VERSION:
+        raise BundleError(f"{filename} has bundle version {version}, expected {BUNDLE_VERSION}")
+    start = _aligned(_PREFIX.size + headerLength)
+    if start > size:
+        raise BundleError(f"{filename} is truncated inside its header")
+    try:
+        header = json.loads(bytes(buffer[_PREFIX.size:_PREFIX.size + headerLength]))
+        checksum, sections, metadata = header['payload_sha256'], header['sections'], header['metadata']
+        if not isinstance(sections, dict) or not isinstance(metadata, dict):
+            raise TypeError("sections and metadata must be objects")
+    except (ValueError, KeyError, TypeError) as e:  # includes JSONDecodeError and UnicodeDecodeError
+        raise BundleError(f"{filename} has a malformed header: {e!r}") from e
+    if verify and hashlib.sha256(memoryview(buffer)[start:]).hexdigest() != checksum:
+        raise BundleError(f"{filename} failed its checksum")
+    arrays = {}
+    for name, section in sections.items():
+        try:
+            dtype = np.dtype(section['dtype'])
+            offset, nbytes = start + section['offset'], section['nbytes']
+            if section['offset'] < 0 or nbytes < 0 or offset + nbytes > size:
+                raise ValueError(f"bytes {offset}-{offset + nbytes} are outside the file")
+            count = nbytes // dtype.itemsize
+            arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset).reshape(section['shape'])
+        except (ValueError, KeyError, TypeError) as e:
+            raise BundleError(f"{filename} has a malformed section {name!r}: {e!r}") from e
+    return arrays, metadata
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Consistency checks for the vectorised solver kernels.
+
+Compares getFeedbackBatch with the reference getFeedback on random word pairs and on
+words with repeated letters, checks that bestGuess picks the same word no matter how
+many worker threads score the guesses, and checks sampled opening-table entries against
+a live search so a stale table is caught. Exits non-zero on any mismatch, so run it
+after touching feedback.py, solver.py, endgame.py, the word lists or the table.
+
+Usage:
+    python check_solver.py
+    python check_solver.py --pairs 200000 --workers 8 --table-samples 10
+"""
+
+import argparse
+import random
+import sys
+
+from feedback import encodeWords, getFeedback, getFeedbackBatch
+from solver import getEngine
+
+# Words whose repeated letters exercise the yellow/green bookkeeping
+REPEATED_LETTER_WORDS = ["eerie", "geese", "llama", "mamma", "sassy", "error", "belle", "added", "tepee", "speed"]
+# (opener, answer) pairs whose filtered candidate sets are used for the worker check
+WORKER_CHECK_GAMES = [("arise", "cigar"), ("arise", "mamma"), ("slate", "eerie")]
+# Pairs compared per getFeedbackBatch call
+CHECK_BLOCK_SIZE = 500
+# Largest feedback bucket re-solved live when checking the opening table (bigger ones take seconds)
+TABLE_CHECK_MAX_CANDIDATES = 200
+
+def checkFeedbackBatch(words: list[str], pairs: int = 100000, seed: int = 0) -> int:
+    """
+    This function compares getFeedbackBatch with getFeedback on every pair of the
+    repeated-letter words (against each other and a random sample of `words`) plus
+    `pairs` random pairs. Returns the number of mismatches.
+    """
+    rng = random.Random(seed)
+    sample = REPEATED_LETTER_WORDS + rng.sample(words, 50)
+    cases = [(guess, answer) for guess in REPEATED_LETTER_WORDS for answer in sample]
+    cases += [(answer, guess) for guess in REPEATED_LETTER_WORDS for answer in sample]
+    cases += [(rng.choice(words), rng.choice(words)) for _ in range(pairs)]
+    guesses, answers = zip(*cases)
+    mismatches = 0
+    for lo in range(0, len(cases), CHECK_BLOCK_SIZE):
+        hi = lo + CHECK_BLOCK_SIZE
+        # the batch scores every guess in the block against every answer; keep the diagonal
+        batch = getFeedbackBatch(encodeWords(guesses[lo:hi]), encodeWords(answers[lo:hi])).diagonal()
+        for (guess, answer), actual in zip(cases[lo:hi], batch.tolist()):
+            expected = getFeedback(guess, answer)
+            if actual != expected:
+                mismatches += 1
+                print(f"feedback mismatch: {guess} vs {answer}: batch {actual}, reference {expected}")
+    return mismatches
+
+def checkWorkerDeterminism(engine, workers: int) -> int:
+    """
+    This function checks that bestGuess returns the same word with one worker and with
+    `workers` workers. Returns the number of games where they differ.
+    """
+    mismatches = 0
+    for opener, answer in WORKER_CHECK_GAMES:
+        candidates = engine.filterCandidates(engine.wordSet, opener, getFeedback(opener, answer))
+        single = engine.bestGuess(candidates, workers=1)
+        parallel = engine.bestGuess(candidates, workers=workers)
+        if single != parallel:
+            mismatches += 1
+            print(f"worker mismatch after {opener}/{answer}: {single} with 1 worker, {parallel} with {workers}")
+    return mismatches
+
+def checkOpeningTable(engine, samples: int = 5, seed: int = 0) -> int:
+    """
+    This function re-solves `samples` random entries per opener of the opening table (at
+    least one endgame-sized bucket among them) and compares the stored reply and ranking
+    with a live engine.suggest. Returns the number of entries that differ, counting a
+    missing or ignored table as one.
+    """
+    if not engine.openingTable:
+        print("opening table missing or built for other settings; run python build_opening_table.py")
+        return 1
+    rng = random.Random(seed)
+    mismatches = 0
+    for opener, replies in sorted(engine.openingTable.items()):
+        entries = sorted((code, replies[code]) for code in replies if replies[code]['candidates'] <= TABLE_CHECK_MAX_CANDIDATES)
+        small = [entry for entry in entries if entry[1]['candidates'] <= engine.endgameThreshold]
+        picked = rng.sample(small, min(1, len(small)))
+        picked += rng.sample([entry for entry in entries if entry not in picked], min(samples - len(picked), len(entries) - len(picked)))
+        row = engine.patternRow(opener)
+        for code, reply in picked:
+            candidates = {engine.words[i] for i in (row == code).nonzero()[0]}
+            top = len(reply['ranking'])
+            nextGuess, ranking = engine.suggest(candidates, max(top, 1))
+            stored = [item[0] for item in reply['ranking']]
+            live = [item['word'] for item in ranking][:top]
+            if nextGuess != reply['next'] or stored != live:
+                mismatches += 1
+                print(f"opening table mismatch for {opener}/{code} ({len(candidates)} candidates): "
+                      f"table {reply['next']} {stored}, live {nextGuess} {live}")
+    return mismatches
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the vectorised feedback kernel and parallel scoring.")
+    parser.add_argument("--pairs", type=int, default=100000, help="random word pairs to compare")
+    parser.add_argument("--workers", type=int, default=4, help="worker count compared against a single worker")
+    parser.add_argument("--table-samples", type=int, default=5, help="opening-table entries per opener re-solved live")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    engine = getEngine()
+    feedbackMismatches = checkFeedbackBatch(engine.words, args.pairs, args.seed)
+    print(f"getFeedbackBatch vs getFeedback: {feedbackMismatches} mismatches")
+    workerMismatches = checkWorkerDeterminism(engine, args.workers)
+    print(f"bestGuess with 1 vs {args.workers} workers: {workerMismatches} mismatches")
+    tableMismatches = checkOpeningTable(engine, args.table_samples, args.seed)
+    print(f"opening table vs live search: {tableMismatches} mismatches")
+    return 1 if feedbackMismatches or workerMismatches or tableMismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Exact endgame solver for small candidate sets.
+
+Once only a handful of candidates remain, the entropy heuristic either wastes a
+guess or sweeps the whole dictionary. Here we instead search exactly for the guess
+that minimises the expected number of guesses still needed, looking only at the
+relevant guesses: the candidates themselves plus the few words that split them best.
+Results, and the guesses looked at for each subset, are memoised by candidate subset.
+"""
+
+import os
+from bisect import bisect_left
+
+import numpy as np # type: ignore
+
+from feedback import ALL_GREEN, encodeWords, getFeedbackBatch
+
+# Largest candidate set handed to the exact search instead of the entropy sweep. The worst
+# sets are word families (?ight, ?ills, ...): 8 of them take about 220 nodes (0.4 s), 10
+# take about 970 and 12 run past 1500, while larger thresholds did not lower the average
+# guess count on historical answers
+ENDGAME_THRESHOLD = int(os.environ.get("WORDLE_ENDGAME_THRESHOLD", 8))
+# Non-candidate guesses considered at each node, picked by how many buckets they make
+ENDGAME_EXTRA_GUESSES = 25
+# Memoised subsets kept before the cache is cleared
+ENDGAME_MEMO_SIZE = 100000
+# Subsets one solveEndgame call may search before giving up and leaving the guess to the
+# scoring strategy; each costs a few milliseconds
+ENDGAME_NODE_BUDGET = int(os.environ.get("WORDLE_ENDGAME_NODE_BUDGET", 250))
+
+class _BudgetExceeded(Exception):
+    """
+    Raised inside the search when a call has used up its node budget.
+    """
+
+_memo = {'pool': None, 'results': {}, 'relevant': {}}  # default cache, keyed by candidate subset
+
+def _lowerBound(size: int) -> float:
+    """
+    This function returns the fewest expected guesses any strategy can need for `size` candidates:
+    guess one of them and have the rest split into singletons.
+    """
+    return (2 * size - 1) / size
+
+def _relevantRows(sub: np.ndarray, guesses: list[str], candidateRows: np.ndarray) -> list[int]:
+    """
+    This function returns the guess rows worth trying for the candidates in rows
+    `candidateRows`, given the feedback `sub` of every guess against them: the candidates
+    first (they can win now), then the best splitting non-candidates.
+    """
+    ordered = np.sort(sub, axis=1)
+    distinct = 1 + np.count_nonzero(ordered[:, 1:] != ordered[:, :-1], axis=1)
+    isCandidate = np.zeros(len(guesses), dtype=bool)
+    isCandidate[candidateRows] = True
+    rows = [int(r) for r in candidateRows]
+    rows.sort(key=lambda r: (-distinct[r], guesses[r]))
+    # a non-candidate that does not split the set can never help
+    others = np.flatnonzero(~isCandidate & (distinct > 1))
+    # rows are alphabetical already, so a stable sort breaks ties by word
+    others = others[np.argsort(-distinct[others], kind='stable')]
+    return rows + others[:ENDGAME_EXTRA_GUESSES].tolist()
+
+def _search(cols: np.ndarray, patterns: np.ndarray, guesses: list[str], candidateRows: np.ndarray, memo: dict, budget: dict):
+    """
+    This function returns (expected guesses, guess row) for the candidates in columns `cols`.
+    `patterns` holds the feedback of every guess (row) against every starting candidate (column);
+    `guesses` is sorted, so memoised words map straight back to rows. Every subset searched
+    uses up one node of `budget`; _BudgetExceeded is raised when none are left.
+    """
+    n = len(cols)
+    if n == 1:
+        return 1.0, int(candidateRows[cols[0]])
+    if n == 2:
+        # guessing either candidate is optimal; take the alphabetically first
+        return 1.5, int(min(candidateRows[cols]))
+    key = frozenset(guesses[r] for r in candidateRows[cols])
+    if key in memo['results']:
+        cost, word = memo['results'][key]
+        return cost, bisect_left(guesses, word)
+    budget['nodes'] -= 1
+    if budget['nodes'] < 0:
+        raise _BudgetExceeded()
+
+    sub = patterns[:, cols]
+    rows = _relevantRows(sub, guesses, candidateRows[cols])
+
+    best = (np.inf, None)
+    floor = _lowerBound(n)
+    for row in rows:
+        values, inverse, sizes = np.unique(sub[row], return_inverse=True, return_counts=True)
+        buckets = [(v, s) for v, s in zip(values, sizes) if v != ALL_GREEN]
+        bound = 1 + sum(2 * s - 1 for _, s in buckets) / n
+        if bound >= best[0] - 1e-12:
+            continue
+        cost = 1.0
+        for i, value in enumerate(values):
+            if value == ALL_GREEN:
+                continue
+            cost += sizes[i] / n * _search(cols[inverse == i], patterns, guesses, candidateRows, memo, budget)[0]
+            if cost >= best[0] - 1e-12:
+                break
+        if cost < best[0] - 1e-12:
+            best = (float(cost), row)
+            if cost <= floor + 1e-12:
+                break
+    if len(memo['results']) >= ENDGAME_MEMO_SIZE:
+        memo['results'].clear()
+        memo['relevant'].clear()
+    memo['results'][key] = (best[0], guesses[best[1]])
+    memo['relevant'][key] = tuple(guesses[r] for r in rows)
+    return best
+
+def _checkPool(memo: dict, allWords: set):
+    if memo['pool'] != allWords:
+        memo['pool'] = set(allWords)
+        memo['results'] = {}
+        memo['relevant'] = {}
+
+def _patterns(candidates: set, allWords: set):
+    """
+    This function returns (sorted guesses, candidate rows, feedback of every guess against
+    every candidate), the tables the search runs on.
+    """
+    guesses = sorted(allWords | candidates)
+    rowOf = {word: i for i, word in enumerate(guesses)}
+    answers = sorted(candidates)
+    candidateRows = np.array([rowOf[word] for word in answers])
+    return guesses, candidateRows, getFeedbackBatch(encodeWords(guesses), encodeWords(answers))
+
+def solveEndgame(candidates: set, allWords: set, memo: dict = None, nodeBudget: int = ENDGAME_NODE_BUDGET):
+    """
+    This function returns (expected remaining guesses, best guess) for a small candidate set.
+    Ties go to candidates, then to the word that splits the set best, then alphabetically.
+    `memo` lets a caller (e.g. a WordleEngine) keep its own cache instead of the module one.
+    Returns None if the search needs more than `nodeBudget` subsets, so the caller can fall
+    back to its scoring strategy; subsets finished by then stay memoised.
+    """
+    memo = _memo if memo is None else memo
+    if len(candidates) == 1:
+        return 1.0, next(iter(candidates))
+    if len(candidates) == 2:
+        return 1.5, min(candidates)  # as in _search, without building the tables
+    _checkPool(memo, allWords)
+    key = frozenset(candidates)
+    if key in memo['results']:
+        return memo['results'][key]
+    guesses, candidateRows, patterns = _patterns(candidates, allWords)
+    try:
+        cost, row = _search(np.arange(len(candidates)), patterns, guesses, candidateRows, memo, {'nodes': nodeBudget})
+    except _BudgetExceeded:
+        return None
+    return cost, guesses[row]
+
+def relevantGuesses(candidates: set, allWords: set, memo: dict = None) -> tuple:
+    """
+    This function returns the guesses the search weighs for a small candidate set: the
+    candidates plus the words that split them best. Sets already searched come from the memo.
+    """
+    memo = _memo if memo is None else memo
+    if len(candidates) <= 2:
+        return tuple(sorted(candidates))  # the search never looks past the candidates here
+    _checkPool(memo, allWords)
+    key = frozenset(candidates)
+    if key not in memo['relevant']:
+        guesses, candidateRows, patterns = _patterns(candidates, allWords)
+        memo['relevant'][key] = tuple(guesses[r] for r in _relevantRows(patterns, guesses, candidateRows))
+    return memo['relevant'][key]
+
+def bestEndgameGuess(candidates: set, allWords: set, memo: dict = None):
+    """
+    This function returns the guess minimising the expected number of remaining guesses,
+    or None if the search runs out of budget. It is meant for small candidate sets (see
+    ENDGAME_THRESHOLD).
+    """
+    result = solveEndgame(candidates, allWords, memo)
+    return None if result is None else result[1]
@@ -1,58 +1,34 @@
-from math import log2
-import numpy as np # type: ignore
 import time
 
-POSSIBLE_WORDS = set()
+from feedback import getFeedback, parseFeedback
+from solver import getEngine
 
-with open("wordle_words.txt", "r") as f:
-    for line in f:
-        POSSIBLE_WORDS.add(line.strip())
+# The shared engine owns the word list, pattern tables and caches (see solver.py)
+ENGINE = getEngine()
+POSSIBLE_WORDS = ENGINE.wordSet
 
 # There are {len(POSSIBLE_WORDS)} possible words loaded
 
-def getFeedback(guess: str, answer: str) -> int:
-    """
-    This function returns the feedback for a given guess and answer.
-    The feedback is a list of 5 integers, where 0 means grey, 1 means yellow, and 2 means green.
-    """
-    chars = list(answer)
-    feedback = [2 if guess[i] == chars[i] else 0 for i in range(5)]
-    for i in range(5):
-        if feedback[i] == 0 and guess[i] in chars:
-            feedback[i] = 1  # yellow
-            chars[chars.index(guess[i])] = None  # consume letter
-    optimized = 0
-    for f in feedback:
-        optimized = 3 * optimized + f
-    return optimized # optimized encoding of feedback stores guesses as decimal numbers
-
 def filterCandidates(candidates: set, guess: str, feedback: int) -> set:
     """
     This function filters the current candidates based on our guess and feedback.
     """
-    filtered = set(word for word in candidates if getFeedback(guess, word) == feedback)
-    return filtered
+    return ENGINE.filterCandidates(candidates, guess, feedback)
 
-def bestGuessVectorized(candidates: set, allWords: set):
+def bestGuessVectorized(candidates: set, allWords: set, workers: int = None):
     """
     This function returns the best guess for the next round.
-    It uses a vectorized approach to compute the best guess.
+    Scoring is done by the shared engine with its configured strategy (entropy by default).
+    """
+    return ENGINE.bestGuess(candidates, allWords, workers=workers)
+
+def chooseGuess(candidates: set, allWords: set, workers: int = None, opening: tuple = None):
     """
-    bestWord = None
-    bestEntropy = -np.inf
-    L = len(candidates)
-    for guess in allWords:
-        counts = np.zeros(3**5)
-        for answer in candidates:
-            counts[getFeedback(guess, answer)] += 1
-        # Filter out zero counts to avoid log(0)
-        nonzero_counts = counts[counts > 0]
-        probabilities = nonzero_counts / L
-        entropy = -np.sum(probabilities * np.log2(probabilities))
-        if entropy > bestEntropy:
-            bestEntropy = entropy
-            bestWord = guess
-    return bestWord
+    This function picks the next guess: the last candidate if only one is left, the exact
+    endgame search for small candidate sets, and the engine's scoring strategy otherwise.
+    On turn two, pass opening=(first guess, feedback) to use the precomputed reply table.
+    """
+    return ENGINE.nextGuess(candidates, allWords, workers=workers, opening=opening)
 
 def solveWordle(candidates: set[str], answer: str, maxGuesses: int = 6, allWords: set[str] = None):
     """
@@ -80,11 +56,7 @@ def solveWordle(candidates: set[str], answer: str, maxGuesses: int = 6, allWords
         if len(candidates) == 0:
             print("No candidates remaining!")
             break
-        if len(candidates) == 1:
-            # If only one candidate remains, just guess it
-            nextGuess = list(candidates)[0]
-        else:
-            nextGuess = bestGuessVectorized(candidates, allWords if allWords else candidates)
+        nextGuess = chooseGuess(candidates, allWords if allWords else candidates, opening=(firstGuess, feedback) if i == 2 else None)
         guesses.append(nextGuess)
         feedback = getFeedback(nextGuess, answer)
         print(f"Round {i}: guess = {nextGuess}, feedback = {feedback}")
@@ -123,15 +95,7 @@ def playWordle(allWords: set[str], maxGuesses: int = 6):
         print("Invalid input. Please enter exactly 5 characters using only 'g', 'y', 'b'")
     
     # Convert feedback to our integer format
-    feedback_list = []
-    for c in feedback_str:
-        if c == 'g': feedback_list.append(2)
-        elif c == 'y': feedback_list.append(1)
-        else: feedback_list.append(0)
-    
-    feedback = 0
-    for f in feedback_list:
-        feedback = 3 * feedback + f
+    feedback = parseFeedback(feedback_str)
     
     guesses.append(firstGuess)
     
@@ -148,10 +112,7 @@ def playWordle(allWords: set[str], maxGuesses: int = 6):
             print("No valid words remain. There might be an error in the feedback.")
             return
         
-        if len(candidates) == 1:
-            nextGuess = list(candidates)[0]
-        else:
-            nextGuess = bestGuessVectorized(candidates, allWords)
+        nextGuess = chooseGuess(candidates, allWords, opening=(firstGuess, feedback) if round_num == 2 else None)
         
         print(f"\nSuggested guess {round_num}: {nextGuess.upper()}")
         
@@ -164,15 +125,7 @@ def playWordle(allWords: set[str], maxGuesses: int = 6):
             print("Invalid input. Please enter exactly 5 characters using only 'g', 'y', 'b'")
         
         # Convert feedback to our integer format
-        feedback_list = []
-        for c in feedback_str:
-            if c == 'g': feedback_list.append(2)
-            elif c == 'y': feedback_list.append(1)
-            else: feedback_list.append(0)
-        
-        feedback = 0
-        for f in feedback_list:
-            feedback = 3 * feedback + f
+        feedback = parseFeedback(feedback_str)
         
         guesses.append(nextGuess)
         
@@ -220,10 +173,7 @@ def testSolverOnHistoricalWordles(allWords: set[str], testWords: list[str], maxG
                 if len(candidates) == 0:
                     break
                 
-                if len(candidates) == 1:
-                    nextGuess = list(candidates)[0]
-                else:
-                    nextGuess = bestGuessVectorized(candidates, allWords)
+                nextGuess = chooseGuess(candidates, allWords, opening=(firstGuess, feedback) if round_num == 2 else None)
                 
                 guesses.append(nextGuess)
                 feedback = getFeedback(nextGuess, word)
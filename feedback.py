@@ -0,0 +1,58 @@
+"""
+Wordle feedback encoding shared by the solver, the endgame search and the web app.
+
+Feedback is stored as a base-3 number (0 grey, 1 yellow, 2 green per letter), so
+242 means all green.
+"""
+
+import numpy as np # type: ignore
+
+FEEDBACK_WEIGHTS = np.array([81, 27, 9, 3, 1])
+ALL_GREEN = 242
+
+def getFeedback(guess: str, answer: str) -> int:
+    """
+    This function returns the feedback for a given guess and answer.
+    The feedback is a list of 5 integers, where 0 means grey, 1 means yellow, and 2 means green.
+    """
+    chars = list(answer)
+    feedback = [2 if guess[i] == chars[i] else 0 for i in range(5)]
+    for i in range(5):
+        if feedback[i] == 0 and guess[i] in chars:
+            feedback[i] = 1  # yellow
+            chars[chars.index(guess[i])] = None  # consume letter
+    optimized = 0
+    for f in feedback:
+        optimized = 3 * optimized + f
+    return optimized # optimized encoding of feedback stores guesses as decimal numbers
+
+def parseFeedback(feedbackString: str) -> int:
+    """
+    This function converts feedback typed as 'g'/'y'/'b' letters into our integer format.
+    """
+    feedback = 0
+    for c in feedbackString:
+        feedback = 3 * feedback + (2 if c == 'g' else 1 if c == 'y' else 0)
+    return feedback
+
+def encodeWords(words) -> np.ndarray:
+    """
+    This function encodes a list of words as an (N, 5) array of letter codes.
+    """
+    if any(len(word) != 5 for word in words):
+        raise ValueError("all words must have exactly 5 letters")
+    return np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8).reshape(-1, 5)
+
+def getFeedbackBatch(guessCodes: np.ndarray, answerCodes: np.ndarray) -> np.ndarray:
+    """
+    This function returns the feedback for every (guess, answer) pair at once.
+    It matches getFeedback exactly and returns a (guesses, answers) array of encoded feedback.
+    """
+    matches = guessCodes[:, None, :, None] == answerCodes[None, :, None, :]
+    green = np.diagonal(matches, axis1=2, axis2=3)
+    available = matches.sum(axis=3)
+    # a letter is yellow while the answer still has copies left after the earlier non-green guesses of it
+    sameEarlier = np.tril(guessCodes[:, :, None] == guessCodes[:, None, :], k=-1)
+    used = (sameEarlier[:, None, :, :] & ~green[:, :, None, :]).sum(axis=3)
+    feedback = np.where(green, 2, np.where(available > used, 1, 0))
+    return feedback @ FEEDBACK_WEIGHTS
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Local load generator for the Flask app.
+
+Simulates many concurrent players. Each one draws answers from
+all_historical_wordles.txt, computes the feedback locally and drives /reset_game and
+/get_next_word with its own game_id. Reports throughput, latency percentiles (overall
+and per game depth) and the server's resident memory over time.
+
+Game state lives in the server process, so gunicorn runs a single worker with threads:
+with several workers, the moves of one game_id would land on workers that never saw
+the earlier ones. A game the server gets wrong (an ERROR word, or a last remaining
+candidate that is not the answer) counts as an error, not as an unsolved game.
+
+Usage:
+    python app.py &                                    # or: gunicorn -w 1 --threads 8 -b 127.0.0.1:7860 app:app
+    python load_test.py --players 16 --games 200 --server-pid $!
+    python load_test.py --spawn gunicorn --players 32 --duration 60 --json report.json
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from feedback import getFeedback
+
+FEEDBACK_LETTERS = "byg"
+
+def feedbackString(guess: str, answer: str) -> str:
+    """
+    This function returns the feedback as the 'b'/'y'/'g' string the web app expects.
+    """
+    code = getFeedback(guess, answer)
+    letters = []
+    for _ in range(5):
+        letters.append(FEEDBACK_LETTERS[code % 3])
+        code //= 3
+    return "".join(reversed(letters))
+
+def postJson(baseUrl: str, path: str, payload: dict, timeout: float):
+    request = urllib.request.Request(
+        baseUrl + path,
+        data=json.dumps(payload).encode(),
+        headers={'Content-Type': 'application/json'},
+        method='POST',
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    This function returns the q-th percentile (0-100) by nearest rank.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(max(1, math.ceil(q / 100 * len(ordered))), len(ordered))
+    return ordered[rank - 1]
+
+def processRss(pid: int) -> int:
+    """
+    This function returns the resident memory (bytes) of a process and all its descendants,
+    read from /proc, so gunicorn workers are included. Returns 0 if it cannot be read.
+    """
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f'/proc/{current}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            pass
+        stack.extend(children.get(current, []))
+    return total
+
+class LoadStats:
+    """
+    Thread-safe collector for request latencies, game results and errors.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {'/reset_game': [], '/get_next_word': []}
+        self.depthLatencies = {}  # round number -> /get_next_word latencies
+        self.games = 0
+        self.solved = 0
+        self.guesses = 0
+        self.errors = 0
+
+    def request(self, path: str, seconds: float, depth: int = None):
+        with self.lock:
+            self.latencies[path].append(seconds)
+            if depth is not None:
+                self.depthLatencies.setdefault(depth, []).append(seconds)
+
+    def game(self, solved: bool, guesses: int):
+        with self.lock:
+            self.games += 1
+            self.solved += solved
+            self.guesses += guesses
+
+    def error(self):
+        with self.lock:
+            self.errors += 1
+
+def playGame(baseUrl: str, gameId: str, answer: str, stats: LoadStats, maxGuesses: int, timeout: float):
+    """
+    Play one game against the server, recording the latency of every request.
+    """
+    start = time.perf_counter()
+    word = postJson(baseUrl, '/reset_game', {'game_id': gameId}, timeout)['word'].lower()
+    stats.request('/reset_game', time.perf_counter() - start)
+    for round_num in range(1, maxGuesses + 1):
+        if word == answer:
+            stats.game(True, round_num)
+            return
+        if round_num == maxGuesses:
+            break
+        start = time.perf_counter()
+        response = postJson(baseUrl, '/get_next_word', {'game_id': gameId, 'feedback': feedbackString(word, answer), 'k': 1}, timeout)
+        stats.request('/get_next_word', time.perf_counter() - start, depth=round_num + 1)
+        word = response['word'].lower()
+        if word == 'error' or (response['candidates_remaining'] == 1 and word != answer):
+            raise RuntimeError(f"game {gameId} lost track of {answer!r} on guess {round_num + 1} (server said {word!r})")
+    stats.game(False, maxGuesses)
+
+def runPlayer(playerId: int, baseUrl: str, answers: list[str], stats: LoadStats, deadline: float, gameBudget, seed: int, maxGuesses: int, timeout: float):
+    """
+    Keep playing random answers until the game budget or the deadline runs out.
+    """
+    rng = random.Random(seed + playerId)
+    gameId = f"load-{os.getpid()}-{playerId}"
+    while time.time() < deadline and gameBudget():
+        try:
+            playGame(baseUrl, gameId, rng.choice(answers), stats, maxGuesses, timeout)
+        except Exception as e:
+            stats.error()
+            print(f"player {playerId}: {e}", file=sys.stderr)
+
+def waitForServer(baseUrl: str, timeout: float = 60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(baseUrl + '/', timeout=2).read()
+            return
+        except Exception:
+            time.sleep(0.25)
+    raise RuntimeError(f"server at {baseUrl} did not come up within {timeout} seconds")
+
+def spawnServer(kind: str, port: int, threads: int):
+    """
+    Start the dev server (without the reloader) or gunicorn on localhost. Gunicorn gets
+    one worker process, since game state is kept in memory, and `threads` threads.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    if kind == 'gunicorn':
+        command = ['gunicorn', '-w', '1', '--threads', str(threads), '-b', f'127.0.0.1:{port}', 'app:app']
+    else:
+        command = [sys.executable, '-m', 'flask', '--app', 'app', 'run', '--port', str(port), '--no-reload', '--with-threads']
+    return subprocess.Popen(command, cwd=here)
+
+def summarize(stats: LoadStats, elapsed: float, rssSamples: list) -> dict:
+    def latencySummary(values):
+        return {
+            'count': len(values),
+            'p50_ms': percentile(values, 50) * 1000,
+            'p90_ms': percentile(values, 90) * 1000,
+            'p99_ms': percentile(values, 99) * 1000,
+            'max_ms': max(values, default=0) * 1000,
+        }
+    requests = sum(len(v) for v in stats.latencies.values())
+    return {
+        'elapsed_s': elapsed,
+        'games': stats.games,
+        'solved': stats.solved,
+        'errors': stats.errors,
+        'average_guesses': stats.guesses / stats.games if stats.games else 0,
+        'requests_per_s': requests / elapsed if elapsed else 0,
+        'games_per_s': stats.games / elapsed if elapsed else 0,
+        'latency': {path: latencySummary(values) for path, values in stats.latencies.items()},
+        'get_next_word_by_depth': {depth: latencySummary(values) for depth, values in sorted(stats.depthLatencies.items())},
+        'rss_samples': rssSamples,
+    }
+
+def printReport(report: dict):
+    print("=" * 60)
+    print("LOAD TEST RESULTS")
+    print("=" * 60)
+    print(f"Elapsed: {report['elapsed_s']:.1f} s, games: {report['games']} (solved {report['solved']}), errors: {report['errors']}")
+    print(f"Throughput: {report['requests_per_s']:.1f} requests/s, {report['games_per_s']:.2f} games/s")
+    print(f"Average guesses: {report['average_guesses']:.2f}")
+    print("\nLatency (ms):        count     p50     p90     p99     max")
+    rows = list(report['latency'].items()) + [(f"  guess {d}", s) for d, s in report['get_next_word_by_depth'].items()]
+    for name, s in rows:
+        print(f"  {name:<18} {s['count']:6d} {s['p50_ms']:7.1f} {s['p90_ms']:7.1f} {s['p99_ms']:7.1f} {s['max_ms']:7.1f}")
+    if report['rss_samples']:
+        print("\nServer RSS over time:")
+        for t, games, rss in report['rss_samples']:
+            print(f"  {t:7.1f} s  {games:6d} games  {rss / 2**20:8.1f} MiB")
+        # measure growth from the first sample taken after warm-up (at least one game played)
+        warm = [sample for sample in report['rss_samples'] if sample[1] > 0]
+        first, last = (warm[0], warm[-1]) if warm else (None, None)
+        if warm and last[1] > first[1]:
+            print(f"  growth: {(last[2] - first[2]) / (last[1] - first[1]) / 1024:.1f} KiB per game")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent Wordle players against the local web app.")
+    parser.add_argument("--url", default=None, help="base URL (default http://127.0.0.1:PORT)")
+    parser.add_argument("--port", type=int, default=7860)
+    parser.add_argument("--players", type=int, default=8, help="concurrent simulated players")
+    parser.add_argument("--games", type=int, default=100, help="total games to play (0 = until --duration)")
+    parser.add_argument("--duration", type=float, default=300, help="stop after this many seconds")
+    parser.add_argument("--answers", default="all_historical_wordles.txt")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-guesses", type=int, default=6)
+    parser.add_argument("--timeout", type=float, default=60, help="per-request timeout in seconds")
+    parser.add_argument("--server-pid", type=int, default=None, help="pid of the server, to sample its RSS")
+    parser.add_argument("--spawn", choices=['dev', 'gunicorn'], default=None, help="start the server for the run")
+    parser.add_argument("--server-threads", type=int, default=8, help="gunicorn threads when spawning (always one worker)")
+    parser.add_argument("--sample-interval", type=float, default=2.0, help="seconds between RSS samples")
+    parser.add_argument("--json", default=None, help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    baseUrl = args.url or f"http://127.0.0.1:{args.port}"
+    with open(args.answers) as f:
+        answers = [line.strip().lower() for line in f if line.strip()]
+
+    server = None
+    if args.spawn:
+        server = spawnServer(args.spawn, args.port, args.server_threads)
+        args.server_pid = server.pid
+    try:
+        waitForServer(baseUrl)
+        stats = LoadStats()
+        remaining = [args.games]
+        budgetLock = threading.Lock()
+
+        def gameBudget():
+            if not args.games:
+                return True
+            with budgetLock:
+                remaining[0] -= 1
+                return remaining[0] >= 0
+
+        rssSamples = []
+        done = threading.Event()
+        start = time.time()
+
+        def sampleRss():
+            while True:
+                if args.server_pid:
+                    rssSamples.append((round(time.time() - start, 2), stats.games, processRss(args.server_pid)))
+                if done.wait(args.sample_interval):
+                    break
+
+        sampler = threading.Thread(target=sampleRss, daemon=True)
+        sampler.start()
+        deadline = start + args.duration
+        with ThreadPoolExecutor(max_workers=args.players) as pool:
+            for playerId in range(args.players):
+                pool.submit(runPlayer, playerId, baseUrl, answers, stats, deadline, gameBudget, args.seed, args.max_guesses, args.timeout)
+        elapsed = time.time() - start
+        done.set()
+        sampler.join()
+        if args.server_pid:
+            rssSamples.append((round(elapsed, 2), stats.games, processRss(args.server_pid)))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = summarize(stats, elapsed, rssSamples)
+    printReport(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,90 +1,299 @@
 #!/usr/bin/env python3
 """
 Web scraper to get all historical Wordle answers from Rock Paper Shotgun
+
+Updates are incremental: the page is requested with ETag/If-Modified-Since, parsed
+in a single streaming pass, and only answers not already in the output file are
+appended. Only answer lists and dated answer paragraphs are read, and only words in
+wordle_words.txt are kept. Appended answers are in date order; the lines already in
+the file keep their order (the bundled list is alphabetical). The validators are only
+saved once the new answers are written, so a failed update is retried on the next run.
+
+Saved HTML pages can be parsed offline with --fixture:
+    python scrape_wordle_answers.py --fixture fixtures/wordle_past_answers.html -o answers.txt
 """
 
-import requests
-from bs4 import BeautifulSoup
+import argparse
+import json
+import os
 import re
-import time
+from datetime import datetime
+from html.parser import HTMLParser
+
+import requests
+
+ARCHIVE_URL = "https://www.rockpapershotgun.com/wordle-past-answers"
+CACHE_FILE = ".wordle_scrape_cache.json"
+DICTIONARY_FILE = "wordle_words.txt"
+
+# Set headers to mimic a real browser
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+WORD_PATTERN = re.compile(r'\b[A-Z]{5}\b')
+DATE_PATTERN = re.compile(
+    r'\b(January|February|March|April|May|June|July|August|September|October|November|December)'
+    r'\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})\b'
+)
+
+class WordleArchiveParser(HTMLParser):
+    """
+    Streaming parser that collects 5-letter answers in document order.
+
+    Only answer entries are harvested: lists (ul/ol) in which every item is a single
+    5-letter word or a dated entry, and paragraphs that carry a date next to uppercase
+    5-letter words. Navigation bars and other page text are ignored, and when a
+    dictionary is given, words outside it are dropped too.
+    """
+
+    LIST_TAGS = {'ul', 'ol'}
+
+    def __init__(self, dictionary=None):
+        super().__init__()
+        self.dictionary = dictionary
+        self.words = {}  # word -> date (dicts keep the order words were first seen)
+        self.lists = []  # entries of each open list, or None once it holds a non-answer item
+        self.li_depth = 0
+        self.li_text = []
+        self.p_depth = 0
+        self.p_text = []
+        self.pending_text = []
+
+    def handle_starttag(self, tag, attrs):
+        self.flush_text()
+        if tag in self.LIST_TAGS:
+            self.lists.append([])
+        elif tag == 'li':
+            self.li_depth += 1
+            if self.li_depth == 1:
+                self.li_text = []
+        elif tag == 'p':
+            self.p_depth += 1
+            if self.p_depth == 1:
+                self.p_text = []
+
+    def handle_endtag(self, tag):
+        self.flush_text()
+        if tag in self.LIST_TAGS and self.lists:
+            entries = self.lists.pop()
+            for word, date in entries or []:
+                self.add_word(word, date)
+        elif tag == 'li' and self.li_depth:
+            self.li_depth -= 1
+            if self.li_depth == 0 and self.lists and self.lists[-1] is not None:
+                entries = list_item_entries("".join(self.li_text))
+                self.lists[-1] = None if entries is None else self.lists[-1] + entries
+        elif tag == 'p' and self.p_depth:
+            self.p_depth -= 1
+            if self.p_depth == 0 and not self.li_depth:
+                for word, date in dated_entries("".join(self.p_text)):
+                    self.add_word(word, date)
+
+    def handle_data(self, data):
+        # text can arrive split across feed() chunks, so hold it until the next tag
+        self.pending_text.append(data)
+
+    def flush_text(self):
+        data = "".join(self.pending_text)
+        self.pending_text = []
+        if self.li_depth:
+            self.li_text.append(data)
+        if self.p_depth:
+            self.p_text.append(data)
+
+    def close(self):
+        super().close()
+        self.flush_text()
+
+    def add_word(self, word, date):
+        if self.dictionary is None or word in self.dictionary:
+            self.words.setdefault(word, date)
+
+def find_date(text):
+    """
+    Return the last date written in the text, or None
+    """
+    date = None
+    for match in DATE_PATTERN.finditer(text):
+        month, day, year = match.groups()
+        date = datetime.strptime(f"{month} {day} {year}", "%B %d %Y").date()
+    return date
+
+def dated_entries(text):
+    """
+    Return (word, date) for each uppercase 5-letter word in a dated piece of text
+    """
+    date = find_date(text)
+    if date is None:
+        return []
+    return [(word.lower(), date) for word in WORD_PATTERN.findall(text)]
+
+def list_item_entries(text):
+    """
+    Return the answers in one list item, or None if the item is not an answer entry
+    """
+    text = text.strip()
+    if len(text) == 5 and text.isascii() and text.isalpha():
+        return [(text.lower(), None)]
+    return dated_entries(text) or None
+
+def parse_wordle_answers(chunks, dictionary=None):
+    """
+    Parse an iterable of HTML text chunks in one pass.
+    Returns a dict mapping each answer to its date (or None), in page order.
+    Words missing from `dictionary` (a set of valid words) are skipped.
+    """
+    parser = WordleArchiveParser(dictionary)
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    return parser.words
+
+def load_dictionary(filename=DICTIONARY_FILE):
+    """
+    Load the valid guesses, which every answer must be one of
+    """
+    if not os.path.exists(filename):
+        return None
+    with open(filename, 'r') as f:
+        return {line.strip().lower() for line in f if line.strip()}
+
+def load_http_cache(filename=CACHE_FILE):
+    """
+    Load the validators (ETag / Last-Modified) from the previous fetch
+    """
+    try:
+        with open(filename, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_http_cache(cache, filename=CACHE_FILE):
+    """
+    Save the validators for the next conditional request
+    """
+    with open(filename, 'w') as f:
+        json.dump(cache, f, indent=2)
+
+def remember_validators(url, validators, filename=CACHE_FILE):
+    """
+    Record the validators of a fetch whose answers have been saved
+    """
+    if not validators:
+        return
+    caches = load_http_cache(filename)
+    caches[url] = validators
+    save_http_cache(caches, filename)
 
-def scrape_wordle_answers(url="https://www.rockpapershotgun.com/wordle-past-answers"):
+def iter_fixture(filename, chunk_size=65536):
     """
-    Scrape all Wordle answers from Rock Paper Shotgun's archive page
+    Yield a saved HTML page in chunks, for offline runs
     """
+    with open(filename, 'r', encoding='utf-8') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+def scrape_wordle_answers(url=ARCHIVE_URL, fixture=None, cache_file=CACHE_FILE, save_fixture=None, conditional=True, dictionary=None):
+    """
+    Scrape all Wordle answers from Rock Paper Shotgun's archive page.
+    Returns (words, validators): a dict of answer -> date in page order, or None if the
+    page has not changed since the last run (HTTP 304), and the page's ETag/Last-Modified.
+    The validators are not saved here; call remember_validators once the answers are
+    written. Pass conditional=False to always refetch, and a set of valid words as
+    `dictionary` to drop anything else.
+    """
+    if fixture:
+        print(f"Parsing Wordle answers from fixture: {fixture}")
+        words = parse_wordle_answers(iter_fixture(fixture), dictionary)
+        print(f"Found {len(words)} unique 5-letter words")
+        return words, None
+
     print(f"Scraping Wordle answers from: {url}")
-    
-    # Set headers to mimic a real browser
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
+    cache = load_http_cache(cache_file).get(url, {}) if conditional else {}
+    headers = dict(HEADERS)
+    if cache.get('etag'):
+        headers['If-None-Match'] = cache['etag']
+    if cache.get('last_modified'):
+        headers['If-Modified-Since'] = cache['last_modified']
+
     try:
-        # Make the request
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        print(f"Successfully fetched page (status: {response.status_code})")
-        
-        # Parse the HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Look for the "All Wordle answers" section
-        # The words are typically in a list or paragraph format
-        words = set()
-        
-        # Method 1: Look for lists containing words
-        for ul in soup.find_all('ul'):
-            for li in ul.find_all('li'):
-                text = li.get_text().strip().upper()
-                # Look for 5-letter words
-                if len(text) == 5 and text.isalpha():
-                    words.add(text.lower())
-        
-        # Method 2: Look for paragraphs with multiple words
-        for p in soup.find_all('p'):
-            text = p.get_text()
-            # Find all 5-letter words in uppercase
-            found_words = re.findall(r'\b[A-Z]{5}\b', text)
-            for word in found_words:
-                words.add(word.lower())
-        
-        # Method 3: Look for div or section containing word lists
-        for div in soup.find_all(['div', 'section']):
-            text = div.get_text()
-            # Find patterns like "WORD" or bullet points with words
-            found_words = re.findall(r'\b[A-Z]{5}\b', text)
-            for word in found_words:
-                words.add(word.lower())
-        
-        # Convert to sorted list
-        word_list = sorted(list(words))
-        
-        print(f"Found {len(word_list)} unique 5-letter words")
-        
-        return word_list
-        
+        with requests.get(url, headers=headers, timeout=10, stream=True) as response:
+            if response.status_code == 304:
+                print("Archive page not modified since last run")
+                return None, None
+            response.raise_for_status()
+            print(f"Successfully fetched page (status: {response.status_code})")
+
+            response.encoding = response.encoding or 'utf-8'
+            chunks = response.iter_content(chunk_size=65536, decode_unicode=True)
+            if save_fixture:
+                chunks = _tee_to_file(chunks, save_fixture)
+            words = parse_wordle_answers(chunks, dictionary)
+            validators = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+            }
+
+        print(f"Found {len(words)} unique 5-letter words")
+        return words, validators
+
     except requests.exceptions.RequestException as e:
         print(f"Error fetching the page: {e}")
+        return {}, None
+
+def _tee_to_file(chunks, filename):
+    """
+    Pass chunks through while writing them to a fixture file
+    """
+    with open(filename, 'w', encoding='utf-8') as f:
+        for chunk in chunks:
+            f.write(chunk)
+            yield chunk
+
+def load_existing_words(filename="all_historical_wordles.txt"):
+    """
+    Load the answers already saved, so only new ones get appended
+    """
+    if not os.path.exists(filename):
         return []
-    except Exception as e:
-        print(f"Error parsing the page: {e}")
-        return []
+    with open(filename, 'r') as f:
+        return [line.strip().lower() for line in f if line.strip()]
+
+def new_answers_in_date_order(words, existing):
+    """
+    Pick the answers not saved yet, oldest first. Dated answers are sorted by date;
+    undated ones follow in page order.
+    """
+    existing = set(existing)
+    new = [(word, date) for word, date in words.items() if word not in existing]
+    new.sort(key=lambda item: (item[1] is None, item[1] or datetime.min.date()))
+    return [word for word, _ in new]
 
-def save_words_to_file(words, filename="all_historical_wordles.txt"):
+def save_words_to_file(words, filename="all_historical_wordles.txt", append=False):
     """
-    Save the scraped words to a file
+    Save the scraped words to a file, or append them to it
     """
     if not words:
         print("No words to save!")
         return False
     
     try:
-        with open(filename, 'w') as f:
+        prefix = ""
+        if append and os.path.exists(filename) and os.path.getsize(filename) > 0:
+            with open(filename, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    prefix = "\n"  # finish the last line first
+        with open(filename, 'a' if append else 'w') as f:
+            f.write(prefix)
             for word in words:
                 f.write(f"{word}\n")
         
-        print(f"Saved {len(words)} words to {filename}")
+        print(f"{'Appended' if append else 'Saved'} {len(words)} words to {filename}")
         return True
         
     except Exception as e:
@@ -162,24 +371,47 @@ def fallback_word_list():
     ]
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incrementally update the list of historical Wordle answers.")
+    parser.add_argument("-o", "--output", default="all_historical_wordles.txt")
+    parser.add_argument("--url", default=ARCHIVE_URL)
+    parser.add_argument("--fixture", help="parse a saved HTML page instead of fetching")
+    parser.add_argument("--save-fixture", help="also save the fetched HTML to this file")
+    parser.add_argument("--cache-file", default=CACHE_FILE, help="where ETag/Last-Modified are kept")
+    parser.add_argument("--dictionary", default=DICTIONARY_FILE, help="valid words; anything else on the page is ignored")
+    args = parser.parse_args()
+
     print("Wordle Answer Scraper")
     print("=" * 40)
     
-    # Try to scrape the words
-    words = scrape_wordle_answers()
-    
-    # If scraping failed or returned too few words, use fallback
-    if len(words) < 100:
-        print(f"Scraping returned only {len(words)} words, using fallback list...")
-        words = fallback_word_list()
-    
-    # Save to file
-    if save_words_to_file(words):
-        print("\nSuccess! You can now test your solver with:")
-        print("python entropy.py")
-        print("Choose option 3 to test on historical Wordles")
+    existing = load_existing_words(args.output)
+    # without saved answers there is nothing to be up to date with, so always refetch
+    dictionary = load_dictionary(args.dictionary)
+    words, validators = scrape_wordle_answers(args.url, args.fixture, args.cache_file, args.save_fixture, conditional=bool(existing), dictionary=dictionary)
+
+    if words is None:
+        print(f"Nothing to do, {args.output} is up to date ({len(existing)} answers)")
+    elif not existing:
+        # First run: if scraping failed or returned too few words, use fallback
+        if len(words) < 100:
+            print(f"Scraping returned only {len(words)} words, using fallback list...")
+            words = fallback_word_list()
+            validators = None  # refetch next time rather than trust this page
+        else:
+            words = new_answers_in_date_order(words, [])
+        if save_words_to_file(words, args.output):
+            remember_validators(args.url, validators, args.cache_file)
+            print("\nSuccess! You can now test your solver with:")
+            print("python entropy.py")
+            print("Choose option 3 to test on historical Wordles")
+        else:
+            print("\nFailed to save words to file")
     else:
-        print("\nFailed to save words to file")
-    
-    print(f"\nFirst 10 words: {words[:10]}")
-    print(f"Last 10 words: {words[-10:]}")
+        new_words = new_answers_in_date_order(words, existing)
+        if new_words:
+            # only the appended answers are in date order; earlier lines keep their order
+            if save_words_to_file(new_words, args.output, append=True):
+                remember_validators(args.url, validators, args.cache_file)
+                print(f"New answers: {new_words}")
+        else:
+            remember_validators(args.url, validators, args.cache_file)
+            print(f"No new answers, {args.output} is up to date ({len(existing)} answers)")
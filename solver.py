@@ -0,0 +1,500 @@
+"""
+Shared Wordle solver engine used by the CLI, the Flask app and the benchmarks.
+
+A WordleEngine owns the word index, the encoded word array, cached feedback rows
+and the endgame memo, so all of that is built once per process (see getEngine).
+How guesses are ranked is pluggable: a scoring strategy takes the (guesses, answers)
+feedback matrix plus per-answer weights and returns one score per guess, higher
+being better.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np # type: ignore
+
+from bundle import BundleError, fileChecksum, loadBundle
+from endgame import ENDGAME_NODE_BUDGET, ENDGAME_THRESHOLD, relevantGuesses, solveEndgame
+from feedback import encodeWords, getFeedback, getFeedbackBatch
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+WORDS_FILE = os.path.join(DATA_DIR, "wordle_words.txt")
+ANSWERS_FILE = os.path.join(DATA_DIR, "all_historical_wordles.txt")
+# Precomputed second guesses, built by build_opening_table.py
+OPENING_TABLE_FILE = os.path.join(DATA_DIR, "opening_replies.json")
+# Binary bundle of all of the above, built by build_bundle.py
+BUNDLE_FILE = os.path.join(DATA_DIR, "wordle_bundle.bin")
+BUNDLE_SOURCES = (WORDS_FILE, ANSWERS_FILE, OPENING_TABLE_FILE)
+
+# Number of threads used to score guesses; the NumPy kernels release the GIL
+NUM_WORKERS = int(os.environ.get("WORDLE_WORKERS", os.cpu_count() or 1))
+# Guesses scored per NumPy call, which bounds the (block, candidates, 5, 5) working set
+SHARD_BLOCK_SIZE = 64
+DEFAULT_STRATEGY = os.environ.get("WORDLE_STRATEGY", "entropy")
+# Prior weight of dictionary words that have never been an answer (known answers weigh 1)
+ANSWER_PRIOR_FLOOR = 0.1
+# Feedback rows (one guess against every word) kept for filtering
+PATTERN_CACHE_SIZE = 256
+
+def loadWords(filename: str) -> list[str]:
+    """
+    This function loads a word list file, one word per line.
+    """
+    with open(filename, "r") as f:
+        return [line.strip().lower() for line in f if line.strip()]
+
+def dictionaryChecksum(words) -> str:
+    """
+    This function returns a checksum identifying a word list, independent of its order.
+    """
+    return hashlib.sha256("\n".join(sorted(words)).encode("ascii")).hexdigest()
+
+def bucketCounts(patterns: np.ndarray, weights: np.ndarray = None) -> np.ndarray:
+    """
+    This function returns a (guesses, 243) array with the (weighted) number of answers
+    that give each feedback for each guess.
+    """
+    offsets = np.arange(len(patterns))[:, None] * 3**5
+    counts = np.bincount((patterns + offsets).ravel(), weights=None if weights is None else np.tile(weights, len(patterns)), minlength=len(patterns) * 3**5)
+    return counts.reshape(len(patterns), 3**5)
+
+def _entropy(counts: np.ndarray) -> np.ndarray:
+    probabilities = counts / counts.sum(axis=1, keepdims=True)
+    # Mask out zero counts to avoid log(0)
+    logs = np.log2(probabilities, where=probabilities > 0, out=np.zeros_like(probabilities, dtype=float))
+    return -np.sum(probabilities * logs, axis=1)
+
+def entropyScore(patterns: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Expected information (in bits) from each guess, treating every candidate as equally likely.
+    """
+    return _entropy(bucketCounts(patterns))
+
+def minimaxScore(patterns: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Minus the size of the largest bucket each guess can leave behind.
+    """
+    return -bucketCounts(patterns).max(axis=1).astype(float)
+
+def expectedSizeScore(patterns: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Minus the expected number of candidates left after each guess.
+    """
+    counts = bucketCounts(patterns)
+    return -(counts ** 2).sum(axis=1) / patterns.shape[1]
+
+def weightedEntropyScore(patterns: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Expected information from each guess, weighting candidates by the answer prior.
+    """
+    return _entropy(bucketCounts(patterns, weights))
+
+def topIndices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    This function returns the indices of the `k` highest scores, best first, using a
+    partial sort. Ties go to the lower index, so the result is deterministic.
+    """
+    if k >= len(scores):
+        return np.lexsort((np.arange(len(scores)), -scores))
+    kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[:k - len(above)]
+    keep = np.concatenate([above, ties])
+    return keep[np.lexsort((keep, -scores[keep]))]
+
+def _mergeTop(parts: list, k: int):
+    """
+    This function merges (rows, scores, entropies, expected) chunks and keeps the top `k`.
+    """
+    rows, scores, entropies, expected = (np.concatenate(column) for column in zip(*parts))
+    order = np.lexsort((rows, -scores))[:k]
+    return rows[order], scores[order], entropies[order], expected[order]
+
+SCORING_STRATEGIES = {
+    'entropy': entropyScore,
+    'minimax': minimaxScore,
+    'expected_size': expectedSizeScore,
+    'weighted': weightedEntropyScore,
+}
+
+class WordleEngine:
+    """
+    Solver state shared by every game in the process.
+
+    Candidate and guess sets are plain sets of words, as in the rest of the code;
+    the engine maps them onto its sorted word index internally. Guesses are always
+    scanned in sorted order and ties go to the earliest word, so results do not
+    depend on set order or on the number of workers.
+    """
+
+    def __init__(self, words, answers=None, strategy: str = DEFAULT_STRATEGY, workers: int = None, endgameThreshold: int = ENDGAME_THRESHOLD,
+                 codes: np.ndarray = None, prior: np.ndarray = None, checksum: str = None, endgameNodeBudget: int = ENDGAME_NODE_BUDGET):
+        # loaders such as fromBundle pass precomputed codes/prior/checksum with words already sorted
+        self.words = list(words) if codes is not None else sorted(set(words))
+        self.wordSet = set(self.words)
+        self.index = {word: i for i, word in enumerate(self.words)}
+        self.codes = encodeWords(self.words) if codes is None else codes
+        if prior is None:
+            answers = set(answers or ())
+            prior = np.array([1.0 if word in answers else ANSWER_PRIOR_FLOOR for word in self.words]) if answers else np.ones(len(self.words))
+        self.prior = prior
+        # identifies the answer list behind the prior, which the 'weighted' strategy depends on
+        self.priorChecksum = hashlib.sha256(np.ascontiguousarray(prior, dtype=np.float64).tobytes()).hexdigest()
+        self.strategy = strategy
+        self.getStrategy()  # fail at startup on an unknown strategy (e.g. a bad WORDLE_STRATEGY)
+        self.workers = workers or NUM_WORKERS
+        self.endgameThreshold = endgameThreshold
+        self.endgameNodeBudget = endgameNodeBudget
+        self.endgameMemo = {'pool': None, 'results': {}, 'relevant': {}}
+        self.checksum = checksum or dictionaryChecksum(self.words)
+        self.openingTable = {}
+        self._patternRows = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def fromBundle(cls, arrays: dict, metadata: dict, **options):
+        """
+        This function builds an engine from a loaded bundle (see build_bundle.py) without
+        re-encoding anything: the word codes, prior and opener feedback rows are views
+        into the mapped file.
+        """
+        letters = arrays['words'].tobytes().decode("ascii")
+        words = [letters[i:i + 5] for i in range(0, len(letters), 5)]
+        engine = cls(words, codes=arrays['words'], prior=arrays['prior'], checksum=metadata['dictionary'], **options)
+        if 'openers' in arrays:
+            letters = arrays['openers'].tobytes().decode("ascii")
+            openers = [letters[i:i + 5] for i in range(0, len(letters), 5)]
+            for opener, row in zip(openers, arrays['opener_patterns']):
+                engine._patternRows[opener] = row
+            if engine._openingTableMatches(metadata.get('opening', {})):
+                engine.openingTable = _openingTableFromArrays(arrays, openers, engine.words)
+        return engine
+
+    def _openingTableMatches(self, table: dict) -> bool:
+        return (table.get('dictionary') == self.checksum and table.get('prior') == self.priorChecksum
+                and table.get('strategy') == self.strategy
+                and table.get('endgame_threshold') == self.endgameThreshold
+                and table.get('endgame_node_budget') == self.endgameNodeBudget)
+
+    def loadOpeningTable(self, filename: str = OPENING_TABLE_FILE) -> bool:
+        """
+        This function loads precomputed second guesses. The table is only used if it was
+        built for this dictionary, answer prior, scoring strategy and endgame settings.
+        """
+        try:
+            with open(filename, "r") as f:
+                table = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        if not self._openingTableMatches(table):
+            return False
+        self.openingTable = {opener: {int(code): reply for code, reply in replies.items()} for opener, replies in table['openers'].items()}
+        return True
+
+    def _isOpenerBucket(self, opener: str, feedback: int, candidates: set, size: int) -> bool:
+        """
+        This function checks that `candidates` is every dictionary word giving `feedback`
+        to `opener`, i.e. the set the table entry was computed for.
+        """
+        if len(candidates) != size or not all(word in self.index for word in candidates):
+            return False
+        return bool((self.patternRow(opener)[[self.index[word] for word in candidates]] == feedback).all())
+
+    def openingReply(self, opener: str, feedback: int, candidates: set, strategy=None, k: int = 1):
+        """
+        This function looks up the precomputed reply to `opener` giving `feedback`.
+        Returns (next guess, ranking) or None if the table cannot answer it, including when
+        `candidates` is not the opener's full feedback bucket (e.g. a smaller answer list).
+        """
+        if strategy not in (None, self.strategy):
+            return None
+        reply = self.openingTable.get(opener, {}).get(feedback)
+        if reply is None or len(reply['ranking']) < min(k, reply['candidates']):
+            return None
+        if not self._isOpenerBucket(opener, feedback, candidates, reply['candidates']):
+            return None
+        ranking = [
+            {'word': word, 'score': score, 'entropy': entropy, 'expected_remaining': expected, 'is_candidate': isCandidate}
+            for word, score, entropy, expected, isCandidate in reply['ranking'][:k]
+        ]
+        return reply['next'], ranking
+
+    def getStrategy(self, strategy=None):
+        """
+        This function resolves a strategy name (or callable) to a scoring function.
+        """
+        strategy = strategy or self.strategy
+        if callable(strategy):
+            return strategy
+        if strategy not in SCORING_STRATEGIES:
+            raise ValueError(f"unknown scoring strategy {strategy!r}, expected one of {sorted(SCORING_STRATEGIES)}")
+        return SCORING_STRATEGIES[strategy]
+
+    def _encode(self, words: list[str]) -> np.ndarray:
+        if all(word in self.index for word in words):
+            return self.codes[[self.index[word] for word in words]]
+        return encodeWords(words)
+
+    def _weights(self, answers: list[str]) -> np.ndarray:
+        return np.array([self.prior[self.index[word]] if word in self.index else ANSWER_PRIOR_FLOOR for word in answers])
+
+    def patternRow(self, guess: str) -> np.ndarray:
+        """
+        This function returns the feedback of `guess` against every word in the index (cached).
+        """
+        row = self._patternRows.get(guess)
+        if row is None:
+            row = getFeedbackBatch(encodeWords([guess]), self.codes)[0].astype(np.uint8)
+            with self._lock:
+                if len(self._patternRows) >= PATTERN_CACHE_SIZE:
+                    self._patternRows.clear()
+                self._patternRows[guess] = row
+        return row
+
+    def filterCandidates(self, candidates: set, guess: str, feedback: int) -> set:
+        """
+        This function filters the current candidates based on our guess and feedback,
+        using the cached feedback row of the guess.
+        """
+        row = self.patternRow(guess)
+        known = [word for word in candidates if word in self.index]
+        filtered = set()
+        if known:
+            rows = row[[self.index[word] for word in known]]
+            filtered = {word for word, keep in zip(known, rows == feedback) if keep}
+        filtered.update(word for word in candidates if word not in self.index and getFeedback(guess, word) == feedback)
+        return filtered
+
+    def _guessList(self, guesses):
+        if guesses is None or guesses is self.wordSet:
+            return self.words, self.codes
+        guesses = sorted(guesses)
+        return guesses, self._encode(guesses)
+
+    def _mapShards(self, shardFn, count: int, workers: int = None) -> list:
+        """
+        This function splits range(count) into one contiguous shard per worker thread and
+        returns shardFn(start, stop) for each shard, in order.
+        """
+        workers = max(1, min(workers or self.workers, count))
+        bounds = np.linspace(0, count, workers + 1).astype(int)
+        if workers == 1:
+            return [shardFn(0, count)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda b: shardFn(*b), zip(bounds[:-1], bounds[1:])))
+
+    def _prepare(self, candidates: set, guesses: set, strategy):
+        guessList, guessCodes = self._guessList(guesses)
+        answers = sorted(candidates)
+        return self.getStrategy(strategy), guessList, guessCodes, self._encode(answers), self._weights(answers)
+
+    def scoreGuesses(self, candidates: set, guesses: set = None, strategy=None, workers: int = None):
+        """
+        This function scores every guess against the candidates.
+        Returns the sorted guess list and an array with one score per guess, computed in
+        shards by `workers` threads (default: the engine's worker count).
+        """
+        score, guessList, guessCodes, answerCodes, weights = self._prepare(candidates, guesses, strategy)
+
+        def scoreShard(start, stop):
+            scores = np.empty(stop - start)
+            for lo in range(start, stop, SHARD_BLOCK_SIZE):
+                hi = min(lo + SHARD_BLOCK_SIZE, stop)
+                scores[lo - start:hi - start] = score(getFeedbackBatch(guessCodes[lo:hi], answerCodes), weights)
+            return scores
+
+        return guessList, np.concatenate(self._mapShards(scoreShard, len(guessList), workers))
+
+    def rankGuesses(self, candidates: set, k: int = 5, guesses: set = None, strategy=None, workers: int = None) -> list[dict]:
+        """
+        This function returns the top `k` guesses by the strategy score, best first, with
+        their entropy and expected number of remaining candidates. Each block of guesses is
+        scored once and cut down to its own top k, so no full sort is needed.
+        """
+        if not candidates:
+            return []
+        score, guessList, guessCodes, answerCodes, weights = self._prepare(candidates, guesses, strategy)
+        L = len(answerCodes)
+
+        def rankShard(start, stop):
+            parts = []
+            for lo in range(start, stop, SHARD_BLOCK_SIZE):
+                hi = min(lo + SHARD_BLOCK_SIZE, stop)
+                patterns = getFeedbackBatch(guessCodes[lo:hi], answerCodes)
+                scores = score(patterns, weights)
+                keep = topIndices(scores, k)
+                counts = bucketCounts(patterns[keep])
+                parts.append((lo + keep, scores[keep], _entropy(counts), (counts ** 2).sum(axis=1) / L))
+            return _mergeTop(parts, k)
+
+        rows, scores, entropies, expected = _mergeTop(self._mapShards(rankShard, len(guessList), workers), k)
+        return [
+            {
+                'word': guessList[row],
+                'score': float(s),
+                'entropy': float(e),
+                'expected_remaining': float(x),
+                'is_candidate': guessList[row] in candidates,
+            }
+            for row, s, e, x in zip(rows, scores, entropies, expected)
+        ]
+
+    def candidatePage(self, candidates: set, page: int = 1, pageSize: int = 50) -> dict:
+        """
+        This function returns one alphabetical page of the remaining candidates.
+        """
+        total = len(candidates)
+        pages = max(1, -(-total // pageSize))
+        page = min(max(1, page), pages)
+        start = (page - 1) * pageSize
+        return {
+            'words': sorted(candidates)[start:start + pageSize],
+            'page': page,
+            'page_size': pageSize,
+            'pages': pages,
+            'total': total,
+        }
+
+    def bestGuess(self, candidates: set, guesses: set = None, strategy=None, workers: int = None):
+        """
+        This function returns the best guess for the next round according to the strategy.
+        """
+        if not candidates:
+            return None
+        guessList, scores = self.scoreGuesses(candidates, guesses, strategy, workers)
+        return guessList[int(np.argmax(scores))]  # argmax keeps the earliest word on ties
+
+    def suggest(self, candidates: set, k: int = 5, strategy=None, workers: int = None, opening: tuple = None):
+        """
+        This function returns the next guess together with the top `k` ranked alternatives,
+        both from the same scoring pass. For small candidate sets the endgame search picks
+        the next guess and only the guesses it weighs are ranked, so no dictionary sweep is
+        needed. Pass opening=(opener, feedback) on turn two to use the precomputed table.
+        """
+        if opening is not None:
+            reply = self.openingReply(*opening, candidates, strategy=strategy, k=k)
+            if reply is not None:
+                return reply
+        if not candidates:
+            return None, []
+        if len(candidates) == 1:
+            return next(iter(candidates)), self.rankGuesses(candidates, k, guesses=candidates, strategy=strategy)
+        if len(candidates) <= self.endgameThreshold:
+            nextGuess = self._endgameGuess(candidates)
+            if nextGuess is not None:
+                relevant = set(relevantGuesses(candidates, self.wordSet, memo=self.endgameMemo))
+                return nextGuess, self.rankGuesses(candidates, k, guesses=relevant, strategy=strategy, workers=workers)
+        ranking = self.rankGuesses(candidates, k, strategy=strategy, workers=workers)
+        return ranking[0]['word'], ranking
+
+    def nextGuess(self, candidates: set, guesses: set = None, strategy=None, workers: int = None, opening: tuple = None):
+        """
+        This function picks the next guess: the last candidate if only one is left, the exact
+        endgame search for small candidate sets, and the scoring strategy otherwise (or when
+        the search runs out of budget). Pass opening=(opener, feedback) on turn two to use
+        the precomputed table.
+        """
+        if opening is not None and guesses in (None, self.wordSet):
+            reply = self.openingReply(*opening, candidates, strategy=strategy)
+            if reply is not None:
+                return reply[0]
+        if len(candidates) == 1:
+            return next(iter(candidates))
+        if 1 < len(candidates) <= self.endgameThreshold:
+            guess = self._endgameGuess(candidates, guesses)
+            if guess is not None:
+                return guess
+        return self.bestGuess(candidates, guesses, strategy, workers)
+
+    def _endgameGuess(self, candidates: set, guesses: set = None):
+        """
+        This function returns the exact endgame search's guess, or None if the search
+        needs more than the engine's node budget.
+        """
+        result = solveEndgame(candidates, self.wordSet if guesses is None else guesses, memo=self.endgameMemo, nodeBudget=self.endgameNodeBudget)
+        return None if result is None else result[1]
+
+class _BundledReplies(Mapping):
+    """
+    Read-only {feedback: reply} view of one opener's replies in a bundle. Replies are
+    unpacked on lookup, so loading the bundle does not build them all up front.
+    """
+
+    def __init__(self, arrays: dict, rows: dict, words: list[str]):
+        self.arrays = arrays
+        self.rows = rows
+        self.words = words
+
+    def __getitem__(self, code):
+        row = self.rows[code]
+        ranking = self.arrays['reply_ranking'][row].tolist()
+        scores = self.arrays['reply_scores'][row].tolist()
+        isCandidate = self.arrays['reply_is_candidate'][row].tolist()
+        return {
+            'next': self.words[int(self.arrays['reply_next'][row])],
+            'candidates': int(self.arrays['reply_candidates'][row]),
+            'ranking': [[self.words[word], *scores[j], bool(isCandidate[j])] for j, word in enumerate(ranking) if word >= 0],
+        }
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+def _openingTableFromArrays(arrays: dict, openers: list[str], words: list[str]) -> dict:
+    """
+    This function wraps the opening-reply sections of a bundle in the same
+    {opener: {feedback: reply}} form loadOpeningTable produces.
+    """
+    rows = {opener: {} for opener in openers}
+    for row, (opener, code) in enumerate(zip(arrays['reply_opener'].tolist(), arrays['reply_code'].tolist())):
+        rows[openers[opener]][code] = row
+    return {opener: _BundledReplies(arrays, rows[opener], words) for opener in openers}
+
+def loadBundledEngine(filename: str = BUNDLE_FILE, verify: bool = True):
+    """
+    This function loads the engine from the binary bundle, or returns None if there is no
+    bundle, it is damaged or it was built from text lists that have changed since.
+    """
+    try:
+        arrays, metadata = loadBundle(filename, verify=verify)
+    except (FileNotFoundError, BundleError):
+        return None
+    sources = metadata.get('sources')
+    for path in BUNDLE_SOURCES:
+        recorded = sources.get(os.path.basename(path)) if isinstance(sources, dict) else None
+        current = fileChecksum(path) if os.path.exists(path) else None
+        if recorded != current:
+            return None  # stale bundle: fall back to the text lists
+    try:
+        return WordleEngine.fromBundle(arrays, metadata)
+    except (KeyError, ValueError):  # sections missing or not what this version writes
+        return None
+
+def loadTextEngine():
+    """
+    This function builds the engine from the text word lists and the JSON opening table.
+    """
+    answers = loadWords(ANSWERS_FILE) if os.path.exists(ANSWERS_FILE) else None
+    engine = WordleEngine(loadWords(WORDS_FILE), answers)
+    engine.loadOpeningTable()
+    return engine
+
+_engine = None
+_engineLock = threading.Lock()
+
+def getEngine() -> WordleEngine:
+    """
+    This function returns the process-wide engine, loading the solver data on first use
+    (from the binary bundle when it is up to date, otherwise from the text lists).
+    """
+    global _engine
+    with _engineLock:
+        if _engine is None:
+            _engine = loadBundledEngine() or loadTextEngine()
+        return _engine